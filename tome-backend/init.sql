@@ -151,6 +151,8 @@ CREATE TABLE authors (
 
 CREATE INDEX idx_authors_name ON authors USING gin(to_tsvector('english', name));
 CREATE INDEX idx_authors_external ON authors(external_source, external_id) WHERE external_source IS NOT NULL;
+-- Conflict arbiter for the scraper's author upsert (ON CONFLICT (external_source, external_id))
+CREATE UNIQUE INDEX idx_authors_external_unique ON authors(external_source, external_id);
 
 -- ----------------------------------------------------------------------------
 -- Genres Table (tome-content service)
@@ -163,6 +165,8 @@ CREATE TABLE genres (
 );
 
 CREATE INDEX idx_genres_name ON genres(name);
+-- Case-insensitive uniqueness; arbiter for the scraper's genre upsert (ON CONFLICT ((LOWER(name))))
+CREATE UNIQUE INDEX idx_genres_name_lower ON genres(LOWER(name));
 
 -- ----------------------------------------------------------------------------
 -- Book Authors Junction Table (tome-content service)
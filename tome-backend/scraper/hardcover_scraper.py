@@ -6,17 +6,42 @@ Continuously scrapes popular books from Hardcover API and imports to database
 
 import os
 import sys
+import csv
+import hashlib
+import io
+import queue
+import re
 import time
+import threading
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import psycopg2
 from psycopg2.extras import execute_values, RealDictCursor
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional, Dict, List, Tuple
 from dotenv import load_dotenv
+from logging.handlers import QueueHandler, QueueListener
+import atexit
 import signal
 import json
 
+# Optional: incremental JSON parsing for large GraphQL responses
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: faster JSON decoding for non-streamed responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv("../.env")
 
@@ -30,11 +55,30 @@ BOOKS_PER_BATCH = int(os.getenv("BOOKS_PER_BATCH", "50"))
 
 # Business logic constants
 MIN_GENRE_TAG_COUNT = 20 # Minimum tag count for genre to be included
-ISBN_10_LENGTH = 10
-ISBN_13_LENGTH = 13
+# Precompiled ISBN validators: one C-level fullmatch instead of len() +
+# isdigit(). re.ASCII keeps \d from matching Unicode digits, mirroring
+# the books isbn_*_format CHECK constraints ('^[0-9]{n}$')
+ISBN_10_RE = re.compile(r"\d{10}", re.ASCII)
+ISBN_13_RE = re.compile(r"\d{13}", re.ASCII)
+# Error messages that indicate duplicates rather than real failures; one
+# case-insensitive scan instead of lower() plus three substring passes
+IGNORABLE_ERROR_RE = re.compile(
+    r"duplicate|already exists|already imported", re.IGNORECASE
+)
 SUPPORTED_LANGUAGES = {"english", "en"}
+# Column length limits from init.sql, enforced at buffering time: batch
+# flushes run in one transaction, so a single over-length value slipping
+# through would roll back the entire batch at flush
+TITLE_MAX_LEN = 500  # books.title / books.subtitle VARCHAR(500)
+PUBLISHER_MAX_LEN = 255  # books.publisher VARCHAR(255)
+AUTHOR_NAME_MAX_LEN = 255  # authors.name VARCHAR(255)
+GENRE_NAME_MAX_LEN = 100  # genres.name VARCHAR(100)
+# Lookup cache bounds; sized well above the expected author/genre working
+# sets so evictions only kick in on pathological runs
+AUTHOR_CACHE_MAX = 50000
+GENRE_CACHE_MAX = 5000
 RETRY_DELAY_SECONDS = 60  # Delay before retrying when no books found
-BATCH_DELAY_SECONDS = 2  # Delay between batches
+COPY_MIN_ROWS = 10  # Minimum batch size before COPY beats a multi-row INSERT
 
 # Database configuration
 DB_CONFIG = {
@@ -49,33 +93,107 @@ DB_CONFIG = {
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FILE = os.getenv("LOG_FILE", "hardcover_scraper.log")
 
-# Setup logging
+# Setup logging. Records go through a queue to a listener thread so the
+# file/stream writes (one write + flush per record) stay off the hot path.
+_log_formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+_log_file_handler = logging.FileHandler(LOG_FILE)
+_log_file_handler.setFormatter(_log_formatter)
+_log_stream_handler = logging.StreamHandler(sys.stdout)
+_log_stream_handler.setFormatter(_log_formatter)
+_log_queue: "queue.Queue" = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, _log_file_handler, _log_stream_handler)
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler(LOG_FILE), logging.StreamHandler(sys.stdout)],
+    handlers=[QueueHandler(_log_queue)],
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger("HardcoverScraper")
 
 
+class LRUCache:
+    """
+    Minimal dict-like LRU cache with a fixed capacity.
+
+    Supports the operations the lookup caches actually use (membership,
+    indexing, clear, len); when full, the least recently touched entry is
+    evicted so cache memory stays bounded on long runs.
+    """
+
+    def __init__(self, maxsize: int, on_evict=None):
+        self.maxsize = maxsize
+        # Called (no arguments) whenever an entry is evicted, so owners
+        # that treat the cache as a complete set can drop that assumption
+        self._on_evict = on_evict
+        self._data: OrderedDict = OrderedDict()
+
+    def __contains__(self, key) -> bool:
+        if key in self._data:
+            self._data.move_to_end(key)
+            return True
+        return False
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            if self._on_evict is not None:
+                self._on_evict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+
 class RateLimiter:
-    """Simple rate limiter to ensure we don't exceed API limits"""
+    """
+    Token-bucket rate limiter to ensure we don't exceed API limits.
+
+    Tokens refill continuously at requests_per_minute / 60 per second up to
+    a small burst capacity. Unlike a fixed inter-request delay, allowance
+    accrued while the scraper is busy writing to the database can be spent
+    immediately, so the probe + details request pair for a batch goes out
+    back-to-back instead of each paying the full gap.
+    """
+
+    # A few requests of headroom; the minute-level average stays capped
+    BURST_CAPACITY = 3
 
     def __init__(self, requests_per_minute: int):
-        self.delay = 60.0 / requests_per_minute
-        self.last_request_time = 0
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(self.BURST_CAPACITY)
+        self.tokens = self.capacity
+        self.last_refill = time.time()
+        # Shared between the main loop and the prefetch thread
+        self._lock = threading.Lock()
 
     def wait(self):
-        """Wait if necessary to maintain rate limit"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """Block until a token is available, then consume it (thread-safe)"""
+        with self._lock:
+            now = time.time()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.last_refill) * self.rate
+            )
+            self.last_refill = now
 
-        if time_since_last < self.delay:
-            sleep_time = self.delay - time_since_last
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
-            time.sleep(sleep_time)
+            if self.tokens < 1.0:
+                sleep_time = (1.0 - self.tokens) / self.rate
+                logger.debug("Rate limiting: sleeping for %.2fs", sleep_time)
+                time.sleep(sleep_time)
+                self.tokens = 1.0
+                self.last_refill = time.time()
 
-        self.last_request_time = time.time()
+            self.tokens -= 1.0
 
 
 class HardcoverAPI:
@@ -86,51 +204,224 @@ class HardcoverAPI:
     rate limits and handling request errors gracefully.
     """
 
+    # Connection pool sizing: the main loop and the prefetch thread can
+    # each have a request in flight, plus headroom so idle connections
+    # stay warm instead of re-paying the TLS handshake
+    POOL_SIZE = 4
+
     def __init__(self, api_token: str, rate_limiter: RateLimiter):
         self.api_token = api_token
         self.rate_limiter = rate_limiter
         self.session = requests.Session()
+        # Retry transient failures (connection resets, 429s, 5xxs) at the
+        # transport layer with exponential backoff instead of losing a page;
+        # GraphQL-over-POST is idempotent here, so retrying POST is safe
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_SIZE,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=retry,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update(
-            {"Authorization": f"Bearer {api_token}", "Content-Type": "application/json"}
+            {
+                "Authorization": f"Bearer {api_token}",
+                "Content-Type": "application/json",
+                # Ask for compressed responses explicitly; book pages are
+                # text-heavy JSON that compresses roughly 10x
+                "Accept-Encoding": "gzip, deflate",
+                # Keep-alive is the urllib3 default, but advertise it so a
+                # proxy in the path doesn't downgrade the connection
+                "Connection": "keep-alive",
+            }
         )
+        # Automatic persisted queries: once a query is registered server-side
+        # we send its sha256 hash instead of the full ~40-line text
+        self._apq_hashes: Dict[str, str] = {}
+        self._apq_registered: set = set()
+        self._apq_supported = True
+
+    def _query_payload(self, query: str, variables: Optional[Dict]) -> Dict:
+        """
+        Build the request payload, using an APQ hash for registered queries.
+
+        The first use of each query sends the full text alongside its hash
+        (which registers it); later requests send only the hash, cutting
+        upload bytes and server parse time. If the server doesn't support
+        APQ, callers fall back and this reverts to plain payloads.
+        """
+        if not self._apq_supported:
+            return {"query": query, "variables": variables or {}}
+
+        query_hash = self._apq_hashes.get(query)
+        if query_hash is None:
+            query_hash = hashlib.sha256(query.encode()).hexdigest()
+            self._apq_hashes[query] = query_hash
+
+        payload = {
+            "variables": variables or {},
+            "extensions": {
+                "persistedQuery": {"version": 1, "sha256Hash": query_hash}
+            },
+        }
+        if query not in self._apq_registered:
+            payload["query"] = query
+        return payload
+
+    @staticmethod
+    def _encode_payload(payload: Dict) -> bytes:
+        """
+        Serialize a request body once, with orjson when available.
+
+        The session already carries Content-Type: application/json, so
+        posting pre-encoded bytes skips requests' per-call stdlib
+        json.dumps; the query text itself is a shared class-level constant
+        either way.
+        """
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload).encode()
+
+    @staticmethod
+    def _is_persisted_query_error(errors: List) -> bool:
+        """Check whether a GraphQL error list signals a missing persisted query"""
+        return any("PersistedQueryNotFound" in str(error) for error in errors)
 
     def _make_request(
         self, query: str, variables: Optional[Dict] = None
     ) -> Optional[Dict]:
         """Make a GraphQL request to Hardcover API"""
+        payload = self._query_payload(query, variables)
         try:
             response = self.session.post(
-                API_BASE_URL,
-                json={"query": query, "variables": variables or {}},
-                timeout=30,
+                API_BASE_URL, data=self._encode_payload(payload), timeout=30
             )
             response.raise_for_status()
-            data = response.json()
+            if orjson is not None:
+                data = orjson.loads(response.content)
+            else:
+                data = response.json()
 
             if "errors" in data:
+                if "query" not in payload:
+                    if self._is_persisted_query_error(data["errors"]):
+                        # Server lost (or never had) the persisted query;
+                        # re-register by resending the full text
+                        logger.debug("Persisted query not found, resending full query")
+                        self._apq_registered.discard(query)
+                        return self._make_request(query, variables)
+                    # Any other error on a hash-only body means the server
+                    # doesn't speak APQ at all; stop sending hashes and
+                    # retry this request with the plain payload
+                    logger.warning(
+                        "Server rejected hash-only request, disabling persisted queries"
+                    )
+                    self._apq_supported = False
+                    return self._make_request(query, variables)
                 logger.error(f"GraphQL errors: {data['errors']}")
                 return None
 
+            if "query" in payload:
+                self._apq_registered.add(query)
             return data.get("data")
 
         except requests.exceptions.RequestException as e:
             logger.error(f"API request failed: {e}")
             return None
 
-    def get_popular_books_with_editions(
-        self, limit: int = 100, offset: int = 0
+    def _stream_items(
+        self, payload: Dict, item_path: str
     ) -> Optional[List[Dict]]:
-        """Get popular books with their edition details in a single query"""
-        query = """
-        query GetPopularBooksWithEditions($limit: Int! = 100, $offset: Int! = 0) {
+        """
+        Make a GraphQL request and parse matching items incrementally.
+
+        Unlike response.json(), which materializes the full response text
+        plus the whole document tree, ijson decodes straight off the wire
+        and keeps only the matched items: the response string and the
+        unparsed envelope around them never exist in memory. The items
+        themselves are still collected into a list for the caller, so
+        peak memory is the batch of parsed books, not one book.
+        """
+        try:
+            response = self.session.post(
+                API_BASE_URL,
+                data=self._encode_payload(payload),
+                timeout=30,
+                stream=True,
+            )
+            response.raise_for_status()
+            # Let urllib3 un-gzip the stream before ijson sees it
+            response.raw.decode_content = True
+            items = list(ijson.items(response.raw, item_path))
+            if not items:
+                # Streaming skips the upfront "errors" check; an empty
+                # result may be an error payload rather than end-of-data
+                logger.warning(f"No items at {item_path} in streamed response")
+            return items
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"API request failed: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to stream-parse API response: {e}")
+            return None
+
+    # Probe pages are deliberately tiny: just enough to paginate (keyset
+    # cursor on users_count/id) and to decide whether each book is new.
+    # Full details are only fetched for books that survive the prefilter,
+    # which avoids shipping cached_tags/descriptions for already-imported
+    # books on steady-state runs.
+    _PROBE_FIELDS = """
+                id
+                users_count
+                default_physical_edition {
+                    id
+                }
+    """
+
+    # First page: no cursor yet, just the most popular books
+    _PROBE_FIRST_QUERY = f"""
+        query GetPopularBookProbes($limit: Int! = 100) {{
+            books(
+                limit: $limit
+                order_by: [{{users_count: desc}}, {{id: desc}}]
+            ) {{
+{_PROBE_FIELDS}
+            }}
+        }}
+    """
+
+    # Subsequent pages: keyset pagination on (users_count, id). Unlike
+    # offset pagination the server does constant work per page instead of
+    # scanning and skipping all previously returned rows.
+    _PROBE_KEYSET_QUERY = f"""
+        query GetPopularBookProbes($limit: Int! = 100, $lastUsersCount: Int!, $lastId: Int!) {{
             books(
                 limit: $limit
-                offset: $offset
-                order_by: {users_count: desc}
-            ) {
+                where: {{_or: [
+                    {{users_count: {{_lt: $lastUsersCount}}}},
+                    {{users_count: {{_eq: $lastUsersCount}}, id: {{_lt: $lastId}}}}
+                ]}}
+                order_by: [{{users_count: desc}}, {{id: desc}}]
+            ) {{
+{_PROBE_FIELDS}
+            }}
+        }}
+    """
+
+    # Full selection for books we actually intend to import; only fields
+    # the importer reads (book title/slug are unused and not requested)
+    _DETAILS_QUERY = """
+        query GetBookDetails($ids: [Int!]!) {
+            books(where: {id: {_in: $ids}}) {
                 id
-                title
-                slug
                 cached_tags
                 description
                 default_physical_edition {
@@ -169,11 +460,93 @@ class HardcoverAPI:
                 }
             }
         }
+    """
+
+    def _query_books(
+        self, query: str, variables: Dict
+    ) -> Optional[List[Dict]]:
+        """Run a books query, stream-parsed when ijson is available"""
+        if ijson is None:
+            data = self._make_request(query, variables)
+            return data.get("books", []) if data else []
+
+        payload = self._query_payload(query, variables)
+        books = self._stream_items(payload, "data.books.item")
+        if books is None:
+            return []
+
+        if not books and "query" not in payload:
+            # Streaming can't inspect the errors array, so an empty result
+            # for a hash-only request may be PersistedQueryNotFound rather
+            # than end-of-data. Retry once with the full text and stop
+            # relying on hash-only sends for this session.
+            self._apq_supported = False
+            self._apq_registered.clear()
+            books = self._stream_items(
+                self._query_payload(query, variables), "data.books.item"
+            )
+            return books if books is not None else []
+
+        if books and "query" in payload:
+            self._apq_registered.add(query)
+        return books
+
+    def get_popular_book_probes(
+        self, limit: int = 100, cursor: Optional[Tuple[int, int]] = None
+    ) -> Optional[List[Dict]]:
         """
+        Get a lightweight page of popular book probes (IDs + cursor fields).
+
+        cursor is the (users_count, id) pair of the last book of the
+        previous page, or None for the first page.
+        """
+        if cursor is None:
+            query = self._PROBE_FIRST_QUERY
+            variables = {"limit": limit}
+        else:
+            query = self._PROBE_KEYSET_QUERY
+            variables = {
+                "limit": limit,
+                "lastUsersCount": cursor[0],
+                "lastId": cursor[1],
+            }
 
-        variables = {"limit": limit, "offset": offset}
-        data = self._make_request(query, variables)
-        return data.get("books", []) if data else []
+        return self._query_books(query, variables)
+
+    def get_book_details(self, book_ids: List[int]) -> Optional[List[Dict]]:
+        """Get full edition details for the given book IDs in a single query"""
+        if not book_ids:
+            return []
+        return self._query_books(self._DETAILS_QUERY, {"ids": book_ids})
+
+
+class BatchBuffer:
+    """
+    Accumulates validated rows for one API batch before a bulk flush.
+
+    Books are keyed by their Hardcover external_id until the flush assigns
+    internal IDs, at which point the buffered author/genre links are resolved
+    against the RETURNING rows.
+    """
+
+    def __init__(self):
+        self.pending_books: List[Tuple] = []
+        # (external_id, author_id, author_order)
+        self.pending_book_authors: List[Tuple[str, int, int]] = []
+        # (external_id, genre_id)
+        self.pending_book_genres: List[Tuple[str, int]] = []
+        # ISBNs already buffered this batch, so in-batch duplicates
+        # don't break the bulk INSERT
+        self.seen_isbns: set = set()
+
+    def __len__(self) -> int:
+        return len(self.pending_books)
+
+    def clear(self):
+        self.pending_books.clear()
+        self.pending_book_authors.clear()
+        self.pending_book_genres.clear()
+        self.seen_isbns.clear()
 
 
 class DatabaseManager:
@@ -189,34 +562,232 @@ class DatabaseManager:
         self.db_config = db_config
         self.conn = None
         self.cursor = None
+        self.fast_cursor = None
         self.current_run_id = None
-        # Performance optimization: cache genre lookups to avoid repeated DB queries
-        self._genre_cache: Dict[str, int] = {}  # genre_name -> genre_id
-        self._author_cache: Dict[int, int] = {}  # hardcover_id -> author_id
+        # Performance optimization: cache genre lookups to avoid repeated DB queries.
+        # Bounded LRU so a long run can't grow the process without limit;
+        # the caps are far above expected working sets, so eviction is rare.
+        # A genre eviction would break the "every genre is cached"
+        # invariant behind _genres_preloaded, so it drops that flag.
+        self._genre_cache = LRUCache(
+            GENRE_CACHE_MAX, on_evict=self._genre_preload_broken
+        )  # genre_name -> genre_id
+        self._author_cache = LRUCache(AUTHOR_CACHE_MAX)  # hardcover_id -> author_id
+        # Rows buffered for the current API batch, flushed in bulk
+        self._batch = BatchBuffer()
+        self._staging_ready = False
+        self._prepared = False
+        # Errors buffered for a per-batch bulk INSERT; kept outside the
+        # BatchBuffer so they survive a batch rollback. Used as fallback
+        # when the background error writer isn't running.
+        self._pending_errors: List[Tuple] = []
+        # Background error writer: log_error enqueues, a daemon thread
+        # drains and bulk-inserts on its own autocommit connection
+        self._error_queue: "queue.Queue[Tuple]" = queue.Queue()
+        self._error_thread: Optional[threading.Thread] = None
+        self._error_conn = None
+        self._error_stop = threading.Event()
+        # True once every genre name is in _genre_cache, making existence
+        # checks pure hash lookups
+        self._genres_preloaded = False
 
     def connect(self):
         """Establish database connection"""
         try:
             self.conn = psycopg2.connect(**self.db_config)
             self.cursor = self.conn.cursor(cursor_factory=RealDictCursor)
+            # Plain tuple cursor for hot single-column reads; RealDictCursor
+            # builds a dict per row, which the hot paths don't need
+            self.fast_cursor = self.conn.cursor()
+            self._tune_session()
+            self._create_staging_table()
+            self._prepare_statements()
+            self._preload_caches()
+            self._start_error_writer()
             logger.info("Database connected successfully")
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
             raise
 
+    def _tune_session(self):
+        """
+        Tune Postgres settings for this best-effort bulk-import session.
+
+        synchronous_commit=off skips the WAL fsync wait at each commit; a
+        server crash can lose at most the last batch, which the resume
+        cursor in scraper_runs re-covers on restart. jit=off avoids JIT
+        compilation overhead on these short statements.
+        """
+        try:
+            self.cursor.execute("SET synchronous_commit = off")
+            self.cursor.execute("SET jit = off")
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            logger.warning(f"Failed to tune session settings: {e}")
+
+    def _create_staging_table(self):
+        """
+        Create the unlogged staging table used by the COPY bulk-load path.
+
+        Unlogged skips WAL for the staging writes; rows are merged into
+        books with a single INSERT ... SELECT ... ON CONFLICT afterwards.
+        """
+        try:
+            self.cursor.execute("""
+                CREATE UNLOGGED TABLE IF NOT EXISTS books_staging (
+                    title VARCHAR(500),
+                    subtitle VARCHAR(500),
+                    isbn_10 VARCHAR(10),
+                    isbn_13 VARCHAR(13),
+                    publisher VARCHAR(255),
+                    published_date DATE,
+                    page_count INTEGER,
+                    ebook_page_count INTEGER,
+                    audio_length_seconds INTEGER,
+                    language VARCHAR(10),
+                    description TEXT,
+                    external_id VARCHAR(100)
+                )
+            """)
+            self.conn.commit()
+            self._staging_ready = True
+        except Exception as e:
+            self.conn.rollback()
+            self._staging_ready = False
+            logger.warning(f"Failed to create staging table, COPY path disabled: {e}")
+
+    def _prepare_statements(self):
+        """
+        Prepare the hot per-row edition lookup server-side.
+
+        EXECUTE by name skips the parse/plan step Postgres would otherwise
+        repeat on every call; author and genre lookups go through their
+        upserts and the bulk existence checks instead.
+        """
+        try:
+            self.cursor.execute("""
+                PREPARE book_by_ext (text) AS
+                SELECT 1 FROM books
+                WHERE external_source = 'hardcover' AND external_id = $1
+            """)
+            self.conn.commit()
+            self._prepared = True
+        except Exception as e:
+            self.conn.rollback()
+            self._prepared = False
+            logger.warning(f"Failed to prepare statements: {e}")
+
+    def _genre_preload_broken(self):
+        """Drop the complete-genre-set assumption; lookups hit the DB again"""
+        self._genres_preloaded = False
+
+    def _preload_caches(self):
+        """
+        Warm the author/genre caches with one query each at startup.
+
+        Popular books repeat the same authors and genres heavily, so paying
+        two queries up front makes most later lookups zero-round-trip.
+        """
+        try:
+            self.fast_cursor.execute("""
+                SELECT external_id, id FROM authors
+                WHERE external_source = 'hardcover'
+            """)
+            for external_id, author_id in self.fast_cursor.fetchall():
+                if external_id and external_id.isdigit():
+                    self._author_cache[int(external_id)] = author_id
+
+            self.fast_cursor.execute("SELECT LOWER(name), id FROM genres")
+            genre_rows = self.fast_cursor.fetchall()
+            for name, genre_id in genre_rows:
+                self._genre_cache[name] = genre_id
+            # Only claim a complete in-cache genre set if it actually fit;
+            # past capacity the LRU evicts during the load and a cache
+            # miss would wrongly read as "genre doesn't exist"
+            self._genres_preloaded = len(genre_rows) <= GENRE_CACHE_MAX
+
+            logger.info(
+                f"Preloaded caches: {len(self._author_cache)} authors, "
+                f"{len(self._genre_cache)} genres"
+            )
+        except Exception as e:
+            # Caches are an optimization; fall back to lazy per-row lookups
+            self.conn.rollback()
+            logger.warning(f"Failed to preload caches: {e}")
+
     def disconnect(self):
         """Close database connection"""
+        if self._error_thread:
+            # Let the writer drain any queued errors before closing
+            self._error_stop.set()
+            self._error_thread.join(timeout=5)
+            self._error_thread = None
+        if self._error_conn:
+            self._error_conn.close()
+            self._error_conn = None
         if self.cursor:
             self.cursor.close()
+        if self.fast_cursor:
+            self.fast_cursor.close()
         if self.conn:
             self.conn.close()
         logger.info("Database disconnected")
 
+    # Maximum errors written per background flush
+    ERROR_FLUSH_MAX = 200
+
+    def _start_error_writer(self):
+        """Start the daemon thread that writes queued errors to the database"""
+        try:
+            self._error_conn = psycopg2.connect(**self.db_config)
+            self._error_conn.autocommit = True
+            self._error_stop.clear()
+            self._error_thread = threading.Thread(
+                target=self._error_writer, name="error-writer", daemon=True
+            )
+            self._error_thread.start()
+        except Exception as e:
+            self._error_conn = None
+            self._error_thread = None
+            logger.warning(f"Background error writer unavailable: {e}")
+
+    def _error_writer(self):
+        """Background loop: drain queued errors and bulk-insert them"""
+        while not (self._error_stop.is_set() and self._error_queue.empty()):
+            try:
+                records = [self._error_queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+
+            # Drain whatever else is already queued, up to the flush cap
+            while len(records) < self.ERROR_FLUSH_MAX:
+                try:
+                    records.append(self._error_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                with self._error_conn.cursor() as cursor:
+                    execute_values(
+                        cursor,
+                        """
+                        INSERT INTO scraper_errors (
+                            scraper_run_id, error_type, hardcover_id, hardcover_type,
+                            error_message, stack_trace
+                        )
+                        VALUES %s
+                    """,
+                        records,
+                    )
+            except Exception as e:
+                logger.error(f"Failed to write {len(records)} errors to database: {e}")
+
     def get_last_incomplete_run(self) -> Optional[Dict]:
         """Get the last incomplete scraper run (running or stopped)"""
         try:
             self.cursor.execute("""
-                SELECT id, last_offset, last_hardcover_book_id
+                SELECT id, last_offset, last_hardcover_book_id, last_users_count
                 FROM scraper_runs
                 WHERE status IN ('running', 'stopped')
                 ORDER BY started_at DESC
@@ -266,6 +837,9 @@ class DatabaseManager:
         if not self.current_run_id:
             return
 
+        # Don't lose errors buffered since the last batch flush
+        self.flush_errors()
+
         try:
             self.cursor.execute(
                 """
@@ -293,54 +867,82 @@ class DatabaseManager:
         errors_count: int = 0,
         last_hardcover_book_id: Optional[int] = None,
         last_offset: Optional[int] = None,
+        last_users_count: Optional[int] = None,
     ):
         """Update statistics for current scraper run"""
         if not self.current_run_id:
             return
 
         try:
-            # Build dynamic query based on what's provided
-            updates = []
-            params = []
-
-            if books_processed > 0:
-                updates.append("books_processed = books_processed + %s")
-                params.append(books_processed)
-
-            if editions_imported > 0:
-                updates.append("editions_imported = editions_imported + %s")
-                params.append(editions_imported)
-
-            if authors_imported > 0:
-                updates.append("authors_imported = authors_imported + %s")
-                params.append(authors_imported)
-
-            if errors_count > 0:
-                updates.append("errors_count = errors_count + %s")
-                params.append(errors_count)
-
-            if last_hardcover_book_id is not None:
-                updates.append("last_hardcover_book_id = %s")
-                params.append(last_hardcover_book_id)
+            # One static statement instead of per-call SQL string building,
+            # so Postgres parses/plans it once and caches the plan.
+            # COALESCE keeps unspecified values unchanged.
+            self.cursor.execute(
+                """
+                UPDATE scraper_runs
+                SET books_processed = books_processed + COALESCE(%s, 0),
+                    editions_imported = editions_imported + COALESCE(%s, 0),
+                    authors_imported = authors_imported + COALESCE(%s, 0),
+                    errors_count = errors_count + COALESCE(%s, 0),
+                    last_hardcover_book_id = COALESCE(%s, last_hardcover_book_id),
+                    last_offset = COALESCE(%s, last_offset),
+                    last_users_count = COALESCE(%s, last_users_count)
+                WHERE id = %s
+            """,
+                (
+                    books_processed or None,
+                    editions_imported or None,
+                    authors_imported or None,
+                    errors_count or None,
+                    last_hardcover_book_id,
+                    last_offset,
+                    last_users_count,
+                    self.current_run_id,
+                ),
+            )
+            self.conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to update run stats: {e}")
+            self.conn.rollback()
 
-            if last_offset is not None:
-                updates.append("last_offset = %s")
-                params.append(last_offset)
+    def update_run_cursor(
+        self,
+        books_processed: int,
+        last_hardcover_book_id: Optional[int],
+        last_offset: Optional[int],
+        last_users_count: Optional[int],
+    ):
+        """
+        Lighter stats write for all-duplicate batches.
 
-            if not updates:
-                return
+        When a batch imports nothing and logs no errors (common while
+        resuming over already-scraped pages), only the progress cursor and
+        the books_processed counter need touching.
+        """
+        if not self.current_run_id:
+            return
 
-            params.append(self.current_run_id)
-            query = f"""
+        try:
+            self.cursor.execute(
+                """
                 UPDATE scraper_runs
-                SET {", ".join(updates)}
+                SET books_processed = books_processed + %s,
+                    last_hardcover_book_id = COALESCE(%s, last_hardcover_book_id),
+                    last_offset = COALESCE(%s, last_offset),
+                    last_users_count = COALESCE(%s, last_users_count)
                 WHERE id = %s
-            """
-
-            self.cursor.execute(query, params)
+            """,
+                (
+                    books_processed,
+                    last_hardcover_book_id,
+                    last_offset,
+                    last_users_count,
+                    self.current_run_id,
+                ),
+            )
             self.conn.commit()
         except Exception as e:
-            logger.error(f"Failed to update run stats: {e}")
+            logger.error(f"Failed to update run cursor: {e}")
             self.conn.rollback()
 
     def log_error(
@@ -351,29 +953,51 @@ class DatabaseManager:
         error_message: str,
         stack_trace: Optional[str] = None,
     ):
-        """Log an error to the database"""
+        """
+        Queue an error for asynchronous logging to scraper_errors.
+
+        The background writer drains the queue and bulk-inserts on its own
+        connection, keeping error logging entirely off the import path. If
+        the writer isn't running, errors fall back to the per-batch buffer.
+        """
+        record = (
+            self.current_run_id,
+            error_type,
+            hardcover_id,
+            hardcover_type,
+            error_message,
+            stack_trace,
+        )
+        if self._error_thread is not None:
+            self._error_queue.put_nowait(record)
+        else:
+            self._pending_errors.append(record)
+
+    def flush_errors(self):
+        """Write all buffered errors to scraper_errors in one statement"""
+        if not self._pending_errors:
+            return
+
         try:
-            self.cursor.execute(
+            execute_values(
+                self.fast_cursor,
                 """
                 INSERT INTO scraper_errors (
                     scraper_run_id, error_type, hardcover_id, hardcover_type,
                     error_message, stack_trace
                 )
-                VALUES (%s, %s, %s, %s, %s, %s)
+                VALUES %s
             """,
-                (
-                    self.current_run_id,
-                    error_type,
-                    hardcover_id,
-                    hardcover_type,
-                    error_message,
-                    stack_trace,
-                ),
+                self._pending_errors,
             )
             self.conn.commit()
         except Exception as e:
-            logger.error(f"Failed to log error to database: {e}")
             self.conn.rollback()
+            logger.error(
+                f"Failed to flush {len(self._pending_errors)} errors to database: {e}"
+            )
+        finally:
+            self._pending_errors.clear()
 
     def get_or_create_author(
         self,
@@ -389,58 +1013,31 @@ class DatabaseManager:
             if hardcover_id in self._author_cache:
                 return self._author_cache[hardcover_id]
 
-            # Start savepoint for author operation
-            self.cursor.execute("SAVEPOINT author_operation")
-
-            try:
-                # Check if we've already imported this Hardcover author using external_id
-                self.cursor.execute(
-                    """
-                    SELECT id FROM authors
-                    WHERE external_source = 'hardcover' AND external_id = %s
-                """,
-                    (str(hardcover_id),),
-                )
-                result = self.cursor.fetchone()
-
-                if result:
-                    author_id = result["id"]
-                    self._author_cache[hardcover_id] = author_id
-                    # Release savepoint on success
-                    self.cursor.execute("RELEASE SAVEPOINT author_operation")
-                    return author_id
-
-                # Create new author
-                self.cursor.execute(
-                    """
-                    INSERT INTO authors (
-                        name, bio, birth_year, death_year,
-                        external_source, external_id,
-                        created_at, updated_at
-                    )
-                    VALUES (%s, %s, %s, %s, 'hardcover', %s, NOW(), NOW())
-                    RETURNING id
-                """,
-                    (name, bio, born_year, death_year, str(hardcover_id)),
+            # Single upsert round trip: the no-op DO UPDATE makes RETURNING
+            # yield the id whether the row was just inserted or already
+            # there (requires the unique index on the external key, see
+            # migrations/add_author_external_unique.sql)
+            self.fast_cursor.execute(
+                """
+                INSERT INTO authors (
+                    name, bio, birth_year, death_year,
+                    external_source, external_id
                 )
+                VALUES (%s, %s, %s, %s, 'hardcover', %s)
+                ON CONFLICT (external_source, external_id)
+                DO UPDATE SET updated_at = authors.updated_at
+                RETURNING id
+            """,
+                (name, bio, born_year, death_year, str(hardcover_id)),
+            )
 
-                author_id = self.cursor.fetchone()["id"]
-                self._author_cache[hardcover_id] = author_id
-
-                # Release savepoint on success
-                self.cursor.execute("RELEASE SAVEPOINT author_operation")
-                logger.info(f"Created author: {name} (Hardcover ID: {hardcover_id})")
-                return author_id
-
-            except Exception as e:
-                # Rollback to savepoint on error
-                self.cursor.execute("ROLLBACK TO SAVEPOINT author_operation")
-                logger.error(f"Failed to get/create author {name}: {e}")
-                return None
+            author_id = self.fast_cursor.fetchone()[0]
+            self._author_cache[hardcover_id] = author_id
+            logger.debug("Upserted author: %s (Hardcover ID: %s)", name, hardcover_id)
+            return author_id
 
         except Exception as e:
-            # Error creating savepoint itself
-            logger.error(f"Failed to create savepoint for author {name}: {e}")
+            logger.error(f"Failed to get/create author {name}: {e}")
             return None
 
     def get_or_create_genre(self, name: str) -> Optional[int]:
@@ -452,275 +1049,252 @@ class DatabaseManager:
                 return None
 
             # Normalize name for cache lookup
-            name_lower = name.lower()
+            name_lower = sys.intern(name.lower())
 
             # Check cache first
             if name_lower in self._genre_cache:
                 return self._genre_cache[name_lower]
 
-            # Start savepoint for genre operation
-            self.cursor.execute("SAVEPOINT genre_operation")
-
-            try:
-                # Check if genre exists (case-insensitive)
-                self.cursor.execute(
-                    """
-                    SELECT id FROM genres WHERE LOWER(name) = LOWER(%s)
-                """,
-                    (name,),
-                )
-                result = self.cursor.fetchone()
-
-                if result:
-                    genre_id = result["id"]
-                    self._genre_cache[name_lower] = genre_id
-                    # Release savepoint on success
-                    self.cursor.execute("RELEASE SAVEPOINT genre_operation")
-                    return genre_id
+            # Single case-insensitive upsert round trip (requires the unique
+            # index on LOWER(name), see migrations/add_genre_lower_unique.sql)
+            self.fast_cursor.execute(
+                """
+                INSERT INTO genres (name)
+                VALUES (%s)
+                ON CONFLICT ((LOWER(name)))
+                DO UPDATE SET name = genres.name
+                RETURNING id
+            """,
+                (name,),
+            )
 
-                # Create new genre
-                self.cursor.execute(
-                    """
-                    INSERT INTO genres (name, created_at)
-                    VALUES (%s, NOW())
-                    RETURNING id
-                """,
-                    (name,),
-                )
+            genre_id = self.fast_cursor.fetchone()[0]
+            self._genre_cache[name_lower] = genre_id
+            logger.debug("Upserted genre: %s", name)
+            return genre_id
 
-                genre_id = self.cursor.fetchone()["id"]
-                self._genre_cache[name_lower] = genre_id
+        except Exception as e:
+            logger.error(f"Failed to get/create genre {name}: {e}")
+            return None
 
-                # Release savepoint on success
-                self.cursor.execute("RELEASE SAVEPOINT genre_operation")
-                logger.info(f"Created genre: {name}")
-                return genre_id
+    def get_existing_edition_ids(self, edition_ids: List[str]) -> Optional[set]:
+        """
+        Return the subset of Hardcover edition IDs already imported.
 
-            except Exception as e:
-                # Rollback to savepoint on error
-                self.cursor.execute("ROLLBACK TO SAVEPOINT genre_operation")
-                logger.error(f"Failed to get/create genre {name}: {e}")
-                return None
+        One ANY(%s) query per API batch instead of one book_exists SELECT
+        per book. Returns None on failure so callers can fall back to the
+        per-book check.
+        """
+        if not edition_ids:
+            return set()
 
+        try:
+            self.fast_cursor.execute(
+                """
+                SELECT external_id FROM books
+                WHERE external_source = 'hardcover' AND external_id = ANY(%s)
+            """,
+                (edition_ids,),
+            )
+            return {row[0] for row in self.fast_cursor.fetchall()}
         except Exception as e:
-            # Error creating savepoint itself
-            logger.error(f"Failed to create savepoint for genre {name}: {e}")
+            self.conn.rollback()
+            logger.error(f"Failed to prefilter existing editions: {e}")
             return None
 
-    def genre_exists(self, name: str) -> bool:
-        """Check if a genre exists in the database"""
-        try:
-            # Validate input
-            if not name or not isinstance(name, str):
-                return False
-
-            # Check cache first
-            name_lower = name.lower()
-            if name_lower in self._genre_cache:
-                return True
+    def which_genres_exist(self, names: List[str]) -> set:
+        """
+        Return the lowercased subset of names that exist as genres.
 
-            # Start savepoint for read operation
-            self.cursor.execute("SAVEPOINT genre_exists_check")
+        Cached names are answered in-process; the rest are checked with a
+        single ANY(%s) query instead of one SELECT per candidate tag.
+        """
+        names_lower = [name.lower() for name in names if name]
+        known = {name for name in names_lower if name in self._genre_cache}
+        missing = [name for name in names_lower if name not in self._genre_cache]
 
+        if missing and not self._genres_preloaded:
             try:
-                self.cursor.execute(
+                self.fast_cursor.execute(
                     """
-                    SELECT id FROM genres WHERE LOWER(name) = LOWER(%s)
+                    SELECT LOWER(name), id FROM genres
+                    WHERE LOWER(name) = ANY(%s)
                 """,
-                    (name,),
+                    (missing,),
                 )
-                result = self.cursor.fetchone()
-
-                # Release savepoint
-                self.cursor.execute("RELEASE SAVEPOINT genre_exists_check")
-
-                if result:
-                    # Update cache if found
-                    self._genre_cache[name_lower] = result["id"]
-                    return True
-                return False
-
+                for name, genre_id in self.fast_cursor.fetchall():
+                    self._genre_cache[name] = genre_id
+                    known.add(name)
             except Exception as e:
-                # Rollback to savepoint on error
-                self.cursor.execute("ROLLBACK TO SAVEPOINT genre_exists_check")
-                logger.error(f"Failed to check genre existence {name}: {e}")
-                return False
+                self.conn.rollback()
+                logger.error(f"Failed to check genre existence in bulk: {e}")
 
-        except Exception as e:
-            # Error creating savepoint itself
-            logger.error(f"Failed to create savepoint for genre check {name}: {e}")
-            return False
+        return known
 
     def book_exists(self, hardcover_edition_id: int) -> bool:
         """Check if we've already imported this edition using external_id"""
         try:
-            # Start savepoint for read operation
-            self.cursor.execute("SAVEPOINT book_exists_check")
-
-            try:
-                self.cursor.execute(
+            if self._prepared:
+                self.fast_cursor.execute(
+                    "EXECUTE book_by_ext (%s)", (str(hardcover_edition_id),)
+                )
+            else:
+                self.fast_cursor.execute(
                     """
                     SELECT 1 FROM books
                     WHERE external_source = 'hardcover' AND external_id = %s
                 """,
                     (str(hardcover_edition_id),),
                 )
-                result = self.cursor.fetchone()
-
-                # Release savepoint
-                self.cursor.execute("RELEASE SAVEPOINT book_exists_check")
-                return result is not None
-
-            except Exception as e:
-                # Rollback to savepoint on error
-                self.cursor.execute("ROLLBACK TO SAVEPOINT book_exists_check")
-                logger.error(f"Failed to check book existence {hardcover_edition_id}: {e}")
-                return False
+            return self.fast_cursor.fetchone() is not None
 
         except Exception as e:
-            # Error creating savepoint itself
-            logger.error(
-                f"Failed to create savepoint for book check {hardcover_edition_id}: {e}"
-            )
+            logger.error(f"Failed to check book existence {hardcover_edition_id}: {e}")
             return False
 
+    @staticmethod
+    def _clean(value) -> Optional[str]:
+        """Strip a string field, mapping empty or non-string values to None"""
+        if isinstance(value, str):
+            value = value.strip()
+            return value or None
+        return None
+
+    @staticmethod
+    def _intern(value: Optional[str]) -> Optional[str]:
+        """
+        Intern a short, heavily repeated string (publisher names, genre
+        cache keys) so duplicates share one object: long-running scrapes
+        keep one copy per distinct value and dict lookups hit the
+        pointer-equality fast path.
+        """
+        if value:
+            return sys.intern(value)
+        return None
+
     def _validate_isbn(
-        self, isbn: Optional[str], expected_length: int
+        self, isbn: Optional[str], pattern: re.Pattern
     ) -> Optional[str]:
         """Validate and return ISBN if valid, None otherwise"""
         if not isbn or not isinstance(isbn, str):
             return None
         isbn = isbn.strip()
-        if len(isbn) == expected_length and isbn.isdigit():
+        if pattern.fullmatch(isbn):
             return isbn
         return None
 
-    def _check_duplicate_isbn(
-        self, isbn_10: Optional[str], isbn_13: Optional[str]
-    ) -> Optional[str]:
-        """Check for duplicate ISBNs in database. Returns error message if duplicate found."""
-        if isbn_10:
-            self.cursor.execute("SELECT id FROM books WHERE isbn_10 = %s", (isbn_10,))
-            if self.cursor.fetchone():
-                return f"Duplicate ISBN-10: {isbn_10}"
-
-        if isbn_13:
-            self.cursor.execute("SELECT id FROM books WHERE isbn_13 = %s", (isbn_13,))
-            if self.cursor.fetchone():
-                return f"Duplicate ISBN-13: {isbn_13}"
+    @staticmethod
+    def _validate_date(value) -> Optional[str]:
+        """
+        Return value if it parses as an ISO date, None otherwise.
 
-        return None
+        release_date comes straight off the API and lands in a DATE
+        column; a malformed one would abort the whole batch flush.
+        """
+        if not value or not isinstance(value, str):
+            return None
+        try:
+            date.fromisoformat(value)
+        except ValueError:
+            return None
+        return value
 
     def _validate_language(self, edition_data: Dict) -> Tuple[bool, str]:
         """Validate language is English. Returns (is_valid, language_code or error_message)"""
         language = "en"
         language_obj = edition_data.get("language")
-        if language_obj and isinstance(language_obj, dict):
+        if language_obj and type(language_obj) is dict:
             lang_name = language_obj.get("language") or ""
             lang_name = lang_name.lower() if isinstance(lang_name, str) else ""
             if lang_name and lang_name not in SUPPORTED_LANGUAGES:
                 return False, f"Non-English language: {lang_name}"
         return True, language
 
-    def _process_book_authors(self, edition_data: Dict, book_id: int) -> int:
-        """Process and link authors to book. Returns count of authors imported."""
+    def _process_book_authors(self, edition_data: Dict, external_id: str) -> int:
+        """Resolve authors and buffer their book links. Returns count of authors buffered."""
         authors_imported = 0
         author_order = 1
 
         contributions = edition_data.get("contributions", [])
         for contribution in contributions:
-            if not contribution or not isinstance(contribution, dict):
+            if not contribution or type(contribution) is not dict:
                 continue
             author_data = contribution.get("author")
-            if not author_data or not isinstance(author_data, dict):
+            if not author_data or type(author_data) is not dict:
                 continue
 
             # Skip authors without a bio
             if not author_data.get("bio"):
-                logger.debug(f"Skipping author {author_data.get('name')} - no bio")
+                logger.debug("Skipping author %s - no bio", author_data.get("name"))
+                continue
+
+            # An over-length name would fail the authors.name varchar and
+            # abort the open batch transaction
+            author_name = self._clean(author_data.get("name"))
+            if not author_name or len(author_name) > AUTHOR_NAME_MAX_LEN:
+                logger.debug("Skipping author %s - missing or over-length name",
+                             author_data.get("id"))
                 continue
 
             author_id = self.get_or_create_author(
                 author_data["id"],
-                author_data["name"],
+                author_name,
                 author_data.get("bio"),
                 author_data.get("born_year"),
                 author_data.get("death_year"),
             )
 
             if author_id:
-                # Link author to book with savepoint
-                try:
-                    self.cursor.execute("SAVEPOINT link_book_author")
-                    self.cursor.execute(
-                        """
-                        INSERT INTO book_authors (book_id, author_id, author_order, created_at)
-                        VALUES (%s, %s, %s, NOW())
-                        ON CONFLICT (book_id, author_id) DO NOTHING
-                    """,
-                        (book_id, author_id, author_order),
-                    )
-                    self.cursor.execute("RELEASE SAVEPOINT link_book_author")
-                    authors_imported += 1
-                    author_order += 1
-                except Exception as e:
-                    self.cursor.execute("ROLLBACK TO SAVEPOINT link_book_author")
-                    logger.error(
-                        f"Failed to link author {author_id} to book {book_id}: {e}"
-                    )
+                self._batch.pending_book_authors.append(
+                    (external_id, author_id, author_order)
+                )
+                authors_imported += 1
+                author_order += 1
 
         return authors_imported
 
-    def _process_book_genres(self, genres: List[str], book_id: int) -> None:
-        """Process and link genres to book"""
+    def _process_book_genres(self, genres: List[str], external_id: str) -> None:
+        """Resolve genres and buffer their book links"""
         for genre_name in genres:
-            if not genre_name:
+            if not genre_name or len(genre_name) > GENRE_NAME_MAX_LEN:
                 continue
 
             genre_id = self.get_or_create_genre(genre_name)
             if genre_id:
-                # Link genre to book with savepoint
-                try:
-                    self.cursor.execute("SAVEPOINT link_book_genre")
-                    self.cursor.execute(
-                        """
-                        INSERT INTO book_genres (book_id, genre_id, created_at)
-                        VALUES (%s, %s, NOW())
-                        ON CONFLICT (book_id, genre_id) DO NOTHING
-                    """,
-                        (book_id, genre_id),
-                    )
-                    self.cursor.execute("RELEASE SAVEPOINT link_book_genre")
-                except Exception as e:
-                    self.cursor.execute("ROLLBACK TO SAVEPOINT link_book_genre")
-                    logger.error(f"Failed to link genre {genre_id} to book {book_id}: {e}")
+                self._batch.pending_book_genres.append((external_id, genre_id))
 
     def import_edition(
         self, edition_data: Dict, book_id: int, book_description: str, genres: List[str],
         ebook_page_count: Optional[int] = None, audio_length_seconds: Optional[int] = None
     ) -> Tuple[bool, str, int]:
-        """Import an edition as a book in our database, returns (success, message, authors_imported)"""
-        try:
-            # Start a savepoint for this import
-            self.cursor.execute("SAVEPOINT edition_import")
+        """
+        Validate an edition and buffer it for the next batch flush.
 
+        Rows are not written here; flush_batch() inserts the whole API batch
+        in a few bulk statements. Returns (success, message, authors_buffered).
+        """
+        try:
             # Validate title
-            title = edition_data.get("title") or ""
-            title = title.strip() if isinstance(title, str) else ""
+            title = self._clean(edition_data.get("title"))
             if not title:
                 return False, "Missing title", 0
+            if len(title) > TITLE_MAX_LEN:
+                return False, f"Title exceeds {TITLE_MAX_LEN} characters", 0
 
             # Validate and normalize ISBNs
-            isbn_10 = self._validate_isbn(edition_data.get("isbn_10"), ISBN_10_LENGTH)
-            isbn_13 = self._validate_isbn(edition_data.get("isbn_13"), ISBN_13_LENGTH)
+            isbn_10 = self._validate_isbn(edition_data.get("isbn_10"), ISBN_10_RE)
+            isbn_13 = self._validate_isbn(edition_data.get("isbn_13"), ISBN_13_RE)
 
             if not isbn_10 and not isbn_13:
                 return False, "Missing or invalid ISBNs", 0
 
-            # Check for duplicate ISBNs
-            duplicate_error = self._check_duplicate_isbn(isbn_10, isbn_13)
-            if duplicate_error:
-                return False, duplicate_error, 0
+            # Check for duplicate ISBNs within the buffered batch; duplicates
+            # already in the database are handled by ON CONFLICT at flush time
+            # instead of two pre-check SELECTs per book
+            if (isbn_10 and isbn_10 in self._batch.seen_isbns) or (
+                isbn_13 and isbn_13 in self._batch.seen_isbns
+            ):
+                return False, f"Duplicate ISBN in batch: {isbn_10 or isbn_13}", 0
 
             # Validate language
             is_valid_language, language_or_error = self._validate_language(edition_data)
@@ -728,37 +1302,30 @@ class DatabaseManager:
                 return False, language_or_error, 0
             language = language_or_error
 
-            # Extract other fields
-            subtitle = edition_data.get("subtitle") or ""
-            subtitle = subtitle.strip() if isinstance(subtitle, str) else ""
-            subtitle = subtitle or None  # Convert empty string to None
-
-            description = book_description or ""
-            description = description.strip() if isinstance(description, str) else ""
-            description = description or None  # Convert empty string to None
+            # Extract other fields (empty strings normalized to None);
+            # over-length optional values and unparseable dates are dropped
+            # rather than failing the book
+            subtitle = self._clean(edition_data.get("subtitle"))
+            if subtitle and len(subtitle) > TITLE_MAX_LEN:
+                subtitle = None
+            description = self._clean(book_description)
             pages = edition_data.get("pages")
             pages = pages if pages and pages > 0 else None
-            release_date = edition_data.get("release_date")
+            release_date = self._validate_date(edition_data.get("release_date"))
 
-            # Safely extract publisher name
+            # Safely extract publisher name; interned since the same
+            # publishers recur across most of the corpus
             publisher_obj = edition_data.get("publisher")
             publisher_name = None
-            if publisher_obj and isinstance(publisher_obj, dict):
-                publisher_name = publisher_obj.get("name")
+            if publisher_obj and type(publisher_obj) is dict:
+                publisher_name = self._intern(self._clean(publisher_obj.get("name")))
+                if publisher_name and len(publisher_name) > PUBLISHER_MAX_LEN:
+                    publisher_name = None
 
-            # Insert book
-            self.cursor.execute(
-                """
-                INSERT INTO books (
-                    title, subtitle, isbn_10, isbn_13, publisher,
-                    published_date, page_count, ebook_page_count, audio_length_seconds,
-                    language, description,
-                    external_source, external_id,
-                    created_at, updated_at
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'hardcover', %s, NOW(), NOW())
-                RETURNING id
-            """,
+            external_id = str(edition_data["id"])
+
+            # Buffer the book row for the batch flush
+            self._batch.pending_books.append(
                 (
                     title,
                     subtitle,
@@ -771,33 +1338,233 @@ class DatabaseManager:
                     audio_length_seconds,
                     language,
                     description,
-                    str(edition_data["id"]),
-                ),
+                    external_id,
+                )
+            )
+            if isbn_10:
+                self._batch.seen_isbns.add(isbn_10)
+            if isbn_13:
+                self._batch.seen_isbns.add(isbn_13)
+
+            # Resolve authors and genres now; their book links are buffered
+            # against external_id and resolved to internal IDs at flush time
+            authors_imported = self._process_book_authors(edition_data, external_id)
+            self._process_book_genres(genres, external_id)
+
+            logger.debug(
+                f"Buffered edition: {title} (Hardcover ID: {edition_data['id']})"
             )
+            return True, f"Buffered for import: {title}", authors_imported
 
-            book_internal_id = self.cursor.fetchone()["id"]
+        except Exception as e:
+            error_msg = f"Error importing edition {edition_data.get('id')}: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg, 0
 
-            # Process authors and genres
-            authors_imported = self._process_book_authors(
-                edition_data, book_internal_id
+    def _bulk_insert_books_values(self, rows: List[Tuple]) -> Dict[str, int]:
+        """Insert book rows with one multi-row INSERT, return external_id -> id"""
+        execute_values(
+            self.fast_cursor,
+            """
+            INSERT INTO books (
+                title, subtitle, isbn_10, isbn_13, publisher,
+                published_date, page_count, ebook_page_count, audio_length_seconds,
+                language, description,
+                external_source, external_id
             )
-            self._process_book_genres(genres, book_internal_id)
+            VALUES %s
+            ON CONFLICT DO NOTHING
+            RETURNING id, external_id
+        """,
+            rows,
+            template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'hardcover', %s)",
+            page_size=max(len(rows), 1),
+        )
+        return {external_id: book_id for book_id, external_id in self.fast_cursor.fetchall()}
 
-            # Release savepoint
-            self.cursor.execute("RELEASE SAVEPOINT edition_import")
-            self.conn.commit()
+    def _bulk_insert_books_copy(self, rows: List[Tuple]) -> Dict[str, int]:
+        """
+        Insert book rows via COPY into the staging table, return external_id -> id.
 
-            logger.info(
-                f"Imported edition: {title} (Hardcover ID: {edition_data['id']})"
+        COPY avoids per-row statement parsing entirely; the staged rows are
+        merged into books with a single INSERT ... SELECT ... ON CONFLICT.
+        """
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerows(rows)
+        buf.seek(0)
+
+        self.fast_cursor.execute("TRUNCATE books_staging")
+        self.fast_cursor.copy_expert(
+            """
+            COPY books_staging (
+                title, subtitle, isbn_10, isbn_13, publisher,
+                published_date, page_count, ebook_page_count, audio_length_seconds,
+                language, description, external_id
+            )
+            FROM STDIN WITH (FORMAT csv, NULL '')
+        """,
+            buf,
+        )
+        self.fast_cursor.execute("""
+            INSERT INTO books (
+                title, subtitle, isbn_10, isbn_13, publisher,
+                published_date, page_count, ebook_page_count, audio_length_seconds,
+                language, description,
+                external_source, external_id
             )
-            return True, f"Successfully imported: {title}", authors_imported
+            SELECT
+                title, subtitle, isbn_10, isbn_13, publisher,
+                published_date, page_count, ebook_page_count, audio_length_seconds,
+                language, description,
+                'hardcover', external_id
+            FROM books_staging
+            ON CONFLICT DO NOTHING
+            RETURNING id, external_id
+        """)
+        return {external_id: book_id for book_id, external_id in self.fast_cursor.fetchall()}
+
+    def flush_batch(self) -> Optional[int]:
+        """
+        Flush all buffered rows in one transaction, returns books imported.
+
+        Issues one execute_values INSERT per table (books, book_authors,
+        book_genres) instead of one round-trip per row, and commits once.
+        On failure the whole batch is rolled back and None is returned; a
+        committed batch where every book was dropped by ON CONFLICT (e.g.
+        ISBN already present under another edition) legitimately returns 0.
+        """
+        batch = self._batch
+        if not batch.pending_books:
+            return 0
+
+        try:
+            # COPY through the staging table wins for full batches; fall back
+            # to a multi-row INSERT for small remainders
+            if self._staging_ready and len(batch.pending_books) >= COPY_MIN_ROWS:
+                id_map = self._bulk_insert_books_copy(batch.pending_books)
+            else:
+                id_map = self._bulk_insert_books_values(batch.pending_books)
+
+            author_rows = [
+                (id_map[external_id], author_id, author_order)
+                for external_id, author_id, author_order in batch.pending_book_authors
+                if external_id in id_map
+            ]
+            if author_rows:
+                # unnest over three parallel arrays: constant SQL text
+                # (plan cache friendly) regardless of row count
+                book_ids, author_ids, orders = zip(*author_rows)
+                self.fast_cursor.execute(
+                    """
+                    INSERT INTO book_authors (book_id, author_id, author_order)
+                    SELECT book_id, author_id, author_order
+                    FROM unnest(%s::bigint[], %s::bigint[], %s::int[])
+                        AS t(book_id, author_id, author_order)
+                    ON CONFLICT (book_id, author_id) DO NOTHING
+                """,
+                    (list(book_ids), list(author_ids), list(orders)),
+                )
+
+            genre_rows = [
+                (id_map[external_id], genre_id)
+                for external_id, genre_id in batch.pending_book_genres
+                if external_id in id_map
+            ]
+            if genre_rows:
+                book_ids, genre_ids = zip(*genre_rows)
+                self.fast_cursor.execute(
+                    """
+                    INSERT INTO book_genres (book_id, genre_id)
+                    SELECT book_id, genre_id
+                    FROM unnest(%s::bigint[], %s::bigint[]) AS t(book_id, genre_id)
+                    ON CONFLICT (book_id, genre_id) DO NOTHING
+                """,
+                    (list(book_ids), list(genre_ids)),
+                )
+
+            self.conn.commit()
+            imported = len(id_map)
+            logger.info(f"Flushed batch: {imported} books imported")
+            return imported
 
         except Exception as e:
-            self.cursor.execute("ROLLBACK TO SAVEPOINT edition_import")
             self.conn.rollback()
-            error_msg = f"Error importing edition {edition_data.get('id')}: {str(e)}"
-            logger.error(error_msg)
-            return False, error_msg, 0
+            # Authors/genres created during validation rolled back too;
+            # drop their cached IDs so they get re-created next batch,
+            # and with the genre cache emptied the preload fast paths
+            # must fall back to the database again
+            self._author_cache.clear()
+            self._genre_cache.clear()
+            self._genres_preloaded = False
+            logger.error(f"Batch flush failed, rolled back {len(batch)} books: {e}")
+            return None
+
+        finally:
+            batch.clear()
+
+
+@dataclass(slots=True)
+class BookRecord:
+    """
+    Validated projection of one book-details payload.
+
+    from_raw performs all the defensive isinstance/.get checks once, so the
+    processing path reads plain attributes instead of re-probing nested
+    dicts per field; slots keep the per-book footprint to a fixed tuple.
+    """
+
+    id: int
+    edition: Optional[Dict]
+    edition_id: Optional[int]
+    cached_tags: Dict
+    description: str
+    ebook_pages: Optional[int]
+    audio_seconds: Optional[int]
+
+    @classmethod
+    def from_raw(cls, book) -> Optional["BookRecord"]:
+        """Project a raw API dict, or None if it has no usable book ID"""
+        if not book or type(book) is not dict:
+            return None
+        get = book.get
+
+        book_id = get("id")
+        if not book_id:
+            return None
+
+        edition = get("default_physical_edition")
+        if not edition or type(edition) is not dict:
+            edition = None
+        edition_id = edition.get("id") if edition else None
+
+        cached_tags = get("cached_tags")
+        if type(cached_tags) is not dict:
+            cached_tags = {}
+
+        ebook_pages = None
+        ebook_edition = get("default_ebook_edition")
+        if ebook_edition and type(ebook_edition) is dict:
+            pages = ebook_edition.get("pages")
+            if pages and pages > 0:
+                ebook_pages = pages
+
+        audio_seconds = None
+        audio_edition = get("default_audio_edition")
+        if audio_edition and type(audio_edition) is dict:
+            seconds = audio_edition.get("audio_seconds")
+            if seconds and seconds > 0:
+                audio_seconds = seconds
+
+        return cls(
+            id=book_id,
+            edition=edition,
+            edition_id=edition_id,
+            cached_tags=cached_tags,
+            description=get("description", "") or "",
+            ebook_pages=ebook_pages,
+            audio_seconds=audio_seconds,
+        )
 
 
 class HardcoverScraper:
@@ -816,18 +1583,18 @@ class HardcoverScraper:
         self.rate_limiter = RateLimiter(REQUESTS_PER_MINUTE)
         self.api = HardcoverAPI(API_TOKEN, self.rate_limiter)
         self.db = DatabaseManager(DB_CONFIG)
-        self.running = True
+        # Stop event rather than a plain bool so background threads
+        # observe shutdown atomically and sleeps can be interrupted;
+        # handlers are registered in main(), not here, so constructing the
+        # scraper never clobbers process signal state
+        self.stop_event = threading.Event()
         self.books_per_batch = BOOKS_PER_BATCH
         self.target_books_limit = TARGET_BOOKS_LIMIT
 
-        # Setup signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
-        self.running = False
+        self.stop_event.set()
 
     def _extract_genres_from_tags(self, cached_tags: Dict) -> List[str]:
         """Extract genre names from cached_tags, prioritizing popular tags"""
@@ -840,22 +1607,29 @@ class HardcoverScraper:
         if not isinstance(genre_tags, list):
             return genres
 
-        # First pass: Get genres with count >= MIN_GENRE_TAG_COUNT
+        # Single pass: collect genres meeting the popularity threshold and,
+        # in the same sweep, every valid tag as a fallback candidate.
+        # Globals are hoisted to locals so the loop body stays LOAD_FAST.
+        min_count = MIN_GENRE_TAG_COUNT
+        candidates = []
+        add_candidate = candidates.append
+        add_genre = genres.append
         for tag_obj in genre_tags:
-            if not tag_obj or not isinstance(tag_obj, dict):
+            if not tag_obj or type(tag_obj) is not dict:
                 continue
             genre_name = tag_obj.get("tag")
-            count = tag_obj.get("count", 0)
-            if genre_name and count >= MIN_GENRE_TAG_COUNT:
-                genres.append(genre_name)
+            if not genre_name:
+                continue
+            add_candidate(genre_name)
+            if tag_obj.get("count", 0) >= min_count:
+                add_genre(genre_name)
 
         # If no genres meet threshold, find first genre that exists in our DB
-        if not genres:
-            for tag_obj in genre_tags:
-                if not tag_obj or not isinstance(tag_obj, dict):
-                    continue
-                genre_name = tag_obj.get("tag")
-                if genre_name and self.db.genre_exists(genre_name):
+        # (all candidates checked with one bulk query / set intersection)
+        if not genres and candidates:
+            existing = self.db.which_genres_exist(candidates)
+            for genre_name in candidates:
+                if genre_name.lower() in existing:
                     genres.append(genre_name)
                     break  # Only need one fallback genre
 
@@ -865,59 +1639,73 @@ class HardcoverScraper:
         """Check if error message is ignorable (duplicates, already exists, etc.)"""
         if not error_message or not isinstance(error_message, str):
             return False
-        ignorable_keywords = ["duplicate", "already exists", "already imported"]
-        return any(keyword in error_message.lower() for keyword in ignorable_keywords)
+        return IGNORABLE_ERROR_RE.search(error_message) is not None
 
-    def _process_book(self, book: Dict) -> Tuple[bool, int, Optional[str]]:
+    def _collect_edition_ids(self, books: List[Dict]) -> List[str]:
+        """Collect physical edition IDs from an API batch for the bulk prefilter"""
+        edition_ids = []
+        for book in books:
+            if not book or type(book) is not dict:
+                continue
+            edition_data = book.get("default_physical_edition")
+            if edition_data and type(edition_data) is dict:
+                edition_id = edition_data.get("id")
+                if edition_id:
+                    edition_ids.append(str(edition_id))
+        return edition_ids
+
+    def _fetch_batch(
+        self, cursor: Optional[Tuple[int, int]]
+    ) -> Optional[List[Dict]]:
+        """Fetch one probe page of books, honoring the shared rate limiter"""
+        self.rate_limiter.wait()
+        return self.api.get_popular_book_probes(
+            limit=self.books_per_batch, cursor=cursor
+        )
+
+    @staticmethod
+    def _page_cursor(books: List[Dict]) -> Optional[Tuple[int, int]]:
+        """Build the keyset cursor (users_count, id) from the last book of a page"""
+        for book in reversed(books):
+            if not book or type(book) is not dict:
+                continue
+            users_count = book.get("users_count")
+            book_id = book.get("id")
+            if users_count is not None and book_id is not None:
+                return users_count, book_id
+        return None
+
+    def _process_book(
+        self, record: BookRecord, already_imported: Optional[set] = None
+    ) -> Tuple[bool, int, Optional[str]]:
         """
-        Process a single book and its edition.
+        Process a single projected book and its edition.
         Returns (success, authors_imported, error_message)
         """
-        book_id = book.get("id")
-        if not book_id:
-            logger.warning("Book missing ID")
-            return False, 0, "Missing book ID"
-
         # Check if book has a physical edition
-        edition_data = book.get("default_physical_edition")
-        if not edition_data or not isinstance(edition_data, dict):
-            logger.warning(f"Book {book_id} has no valid physical edition to import")
+        if record.edition is None:
+            logger.warning(f"Book {record.id} has no valid physical edition to import")
             return False, 0, "No physical edition"
 
-        edition_id = edition_data.get("id")
-        if not edition_id:
-            logger.warning(f"Book {book_id} edition missing ID")
+        if not record.edition_id:
+            logger.warning(f"Book {record.id} edition missing ID")
             return False, 0, "Missing edition ID"
 
-        # Check if already imported
-        if self.db.book_exists(edition_id):
-            logger.debug(f"Edition {edition_id} already imported, skipping")
+        # Check if already imported (batch prefilter set, or per-book fallback)
+        if already_imported is not None:
+            if str(record.edition_id) in already_imported:
+                logger.debug("Edition %s already imported, skipping", record.edition_id)
+                return False, 0, "Already imported"
+        elif self.db.book_exists(record.edition_id):
+            logger.debug("Edition %s already imported, skipping", record.edition_id)
             return False, 0, "Already imported"
 
-        # Extract genres and description
-        genres = self._extract_genres_from_tags(book.get("cached_tags", {}))
-        book_description = book.get("description", "")
-
-        # Extract ebook page count
-        ebook_page_count = None
-        ebook_edition = book.get("default_ebook_edition")
-        if ebook_edition and isinstance(ebook_edition, dict):
-            ebook_pages = ebook_edition.get("pages")
-            if ebook_pages and ebook_pages > 0:
-                ebook_page_count = ebook_pages
-
-        # Extract audiobook length in seconds
-        audio_length_seconds = None
-        audio_edition = book.get("default_audio_edition")
-        if audio_edition and isinstance(audio_edition, dict):
-            audio_seconds = audio_edition.get("audio_seconds")
-            if audio_seconds and audio_seconds > 0:
-                audio_length_seconds = audio_seconds
+        genres = self._extract_genres_from_tags(record.cached_tags)
 
         # Import the edition
         success, message, authors_imported = self.db.import_edition(
-            edition_data, book_id, book_description, genres,
-            ebook_page_count, audio_length_seconds
+            record.edition, record.id, record.description, genres,
+            record.ebook_pages, record.audio_seconds
         )
 
         return success, authors_imported, None if success else message
@@ -928,139 +1716,238 @@ class HardcoverScraper:
             f"Starting Hardcover scraper (target: {self.target_books_limit} books)..."
         )
 
+        # Dedicated single worker so the next API page downloads while the
+        # current batch is being written to the database
+        prefetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-prefetch")
+        next_batch = None
+
+        # Hot-loop locals: attribute reads inside the batch loop become
+        # LOAD_FAST instead of per-iteration instance __dict__ lookups
+        db = self.db
+        api = self.api
+        rate_limiter = self.rate_limiter
+        stop_event = self.stop_event
+        target = self.target_books_limit
+
         try:
-            self.db.connect()
+            db.connect()
 
             # Check for incomplete run to resume
-            incomplete_run = self.db.get_last_incomplete_run()
+            incomplete_run = db.get_last_incomplete_run()
             resume_run_id = None
-            offset = 0
+            cursor = None
+            books_seen = 0
 
             if incomplete_run and isinstance(incomplete_run, dict):
                 resume_run_id = incomplete_run.get("id")
-                offset = incomplete_run.get("last_offset", 0) or 0
+                books_seen = incomplete_run.get("last_offset", 0) or 0
+                last_users_count = incomplete_run.get("last_users_count")
                 last_book_id = incomplete_run.get("last_hardcover_book_id")
+                if last_users_count is not None and last_book_id is not None:
+                    cursor = (last_users_count, last_book_id)
                 logger.info(
-                    f"Found incomplete run {resume_run_id}. Resuming from offset {offset}, last book ID: {last_book_id}"
+                    f"Found incomplete run {resume_run_id}. Resuming from cursor {cursor}"
                 )
             else:
                 logger.info("No incomplete run found. Starting fresh.")
 
-            self.db.start_scraper_run(resume_run_id=resume_run_id)
+            db.start_scraper_run(resume_run_id=resume_run_id)
 
             total_books_processed = 0
             total_editions_imported = 0
             total_authors_imported = 0
             total_errors = 0
-            last_book_id = None
-
-            while self.running:
-                logger.info(f"Fetching books batch (offset: {offset})...")
 
-                # Apply rate limiting before API call
-                self.rate_limiter.wait()
+            while not stop_event.is_set():
+                logger.info(f"Fetching books batch (cursor: {cursor})...")
 
-                # Get batch of popular books WITH edition details (single query!)
-                books = self.api.get_popular_books_with_editions(
-                    limit=self.books_per_batch, offset=offset
-                )
+                # Use the prefetched page when available; otherwise fetch now
+                # (single GraphQL query gets books WITH edition details)
+                if next_batch is not None:
+                    books = next_batch.result()
+                    next_batch = None
+                else:
+                    books = self._fetch_batch(cursor)
 
                 if not books:
                     logger.info("No more books to process, starting over...")
-                    offset = 0
-                    time.sleep(RETRY_DELAY_SECONDS)
+                    cursor = None
+                    # Interruptible: a shutdown signal ends the wait at once
+                    stop_event.wait(RETRY_DELAY_SECONDS)
                     continue
 
+                # Advance the keyset cursor to the end of this page and kick
+                # off the next page download while this batch is imported
+                next_cursor = self._page_cursor(books)
+                if next_cursor is None:
+                    logger.warning("Page missing cursor fields, restarting from top")
+                if not stop_event.is_set() and next_cursor is not None:
+                    next_batch = prefetch.submit(self._fetch_batch, next_cursor)
+
+                # Prefilter already-imported editions with one query per batch
+                already_imported = db.get_existing_edition_ids(
+                    self._collect_edition_ids(books)
+                )
+
                 # Track batch-level counts (for incremental stats update)
-                batch_editions_imported = 0
+                batch_buffered = 0
                 batch_authors_imported = 0
                 batch_errors = 0
 
-                for book in books:
-                    if not self.running:
-                        break
-
+                # Classify probes: only new, importable books are worth a
+                # full-details fetch
+                new_book_ids = []
+                for probe in books:
                     # Skip invalid book entries
-                    if not book or not isinstance(book, dict):
+                    if not probe or type(probe) is not dict:
                         continue
 
-                    try:
-                        book_id = book.get("id")
-                        if not book_id:
-                            logger.warning("Book missing ID, skipping")
-                            continue
+                    probe_id = probe.get("id")
+                    if not probe_id:
+                        logger.warning("Book missing ID, skipping")
+                        continue
+
+                    total_books_processed += 1
+
+                    edition_data = probe.get("default_physical_edition")
+                    edition_id = None
+                    if edition_data and type(edition_data) is dict:
+                        edition_id = edition_data.get("id")
+                    if not edition_id:
+                        logger.warning(
+                            f"Book {probe_id} has no valid physical edition to import"
+                        )
+                        batch_errors += 1
+                        total_errors += 1
+                        db.log_error(
+                            "import_error", None, "edition", "No physical edition"
+                        )
+                        continue
+
+                    if (
+                        already_imported is not None
+                        and str(edition_id) in already_imported
+                    ):
+                        logger.debug("Edition %s already imported, skipping", edition_id)
+                        continue
+
+                    new_book_ids.append(probe_id)
+
+                # Second phase: fetch full details only for the survivors
+                details = []
+                if new_book_ids and not stop_event.is_set():
+                    rate_limiter.wait()
+                    details = api.get_book_details(new_book_ids) or []
 
-                        last_book_id = book_id
-                        total_books_processed += 1
+                for book in details:
+                    if stop_event.is_set():
+                        break
+
+                    # Stop buffering once the flushed total plus this
+                    # batch's buffered rows would hit the target; the
+                    # remaining books would be wasted work
+                    if total_editions_imported + batch_buffered >= target:
+                        logger.info("Target reached mid-batch, short-circuiting")
+                        break
 
+                    # Validate once into a typed projection; skip junk rows
+                    record = BookRecord.from_raw(book)
+                    if record is None:
+                        continue
+
+                    try:
                         # Process the book
                         success, authors_imported, error_message = self._process_book(
-                            book
+                            record, already_imported
                         )
 
                         if success:
-                            batch_editions_imported += 1
+                            batch_buffered += 1
                             batch_authors_imported += authors_imported
-                            total_editions_imported += 1
-                            total_authors_imported += authors_imported
-                            logger.info(
-                                f"Progress: {total_editions_imported} editions imported"
-                            )
                         elif error_message and not self._is_ignorable_error(
                             error_message
                         ):
                             # Log non-ignorable errors
                             batch_errors += 1
                             total_errors += 1
-                            # Safely extract edition ID
-                            edition_obj = book.get("default_physical_edition")
-                            edition_id = None
-                            if edition_obj and isinstance(edition_obj, dict):
-                                edition_id = edition_obj.get("id")
-                            self.db.log_error(
-                                "import_error", edition_id, "edition", error_message
+                            db.log_error(
+                                "import_error",
+                                record.edition_id,
+                                "edition",
+                                error_message,
                             )
 
                     except Exception as e:
                         batch_errors += 1
                         total_errors += 1
-                        logger.error(f"Error processing book {book.get('id')}: {e}")
-                        self.db.log_error(
-                            "processing_error", book.get("id"), "book", str(e)
+                        logger.error(f"Error processing book {record.id}: {e}")
+                        db.log_error(
+                            "processing_error", record.id, "book", str(e)
                         )
 
-                # Update offset for next batch
-                offset += self.books_per_batch
-
-                # Update run statistics with last processed book ID and offset (use batch counts, not totals!)
-                self.db.update_run_stats(
-                    books_processed=len(books),
-                    editions_imported=batch_editions_imported,
-                    authors_imported=batch_authors_imported,
-                    errors_count=batch_errors,
-                    last_hardcover_book_id=last_book_id,
-                    last_offset=offset,
-                )
+                # Flush the buffered batch to the database in bulk; None
+                # means the transaction rolled back, while 0 is a committed
+                # batch whose books were all absorbed by ON CONFLICT
+                batch_editions_imported = db.flush_batch()
+                db.flush_errors()
+                if batch_editions_imported is None:
+                    batch_editions_imported = 0
+                    if batch_buffered:
+                        batch_errors += 1
+                        total_errors += 1
+                        batch_authors_imported = 0
+                total_editions_imported += batch_editions_imported
+                total_authors_imported += batch_authors_imported
+
+                # Advance the cursor for the next batch
+                cursor = next_cursor
+                books_seen += len(books)
+
+                # Update run statistics with the page-end cursor (use batch
+                # counts, not totals!); all-duplicate batches take the
+                # lighter cursor-only write
+                if (
+                    batch_editions_imported == 0
+                    and batch_authors_imported == 0
+                    and batch_errors == 0
+                ):
+                    db.update_run_cursor(
+                        books_processed=len(books),
+                        last_hardcover_book_id=cursor[1] if cursor else None,
+                        last_offset=books_seen,
+                        last_users_count=cursor[0] if cursor else None,
+                    )
+                else:
+                    db.update_run_stats(
+                        books_processed=len(books),
+                        editions_imported=batch_editions_imported,
+                        authors_imported=batch_authors_imported,
+                        errors_count=batch_errors,
+                        last_hardcover_book_id=cursor[1] if cursor else None,
+                        last_offset=books_seen,
+                        last_users_count=cursor[0] if cursor else None,
+                    )
                 logger.info(
                     f"Batch complete. Total: {total_editions_imported} editions imported, {total_errors} errors"
                 )
 
                 # Check if we've reached the target limit
-                if total_editions_imported >= self.target_books_limit:
+                if total_editions_imported >= target:
                     logger.info(
-                        f"Target of {self.target_books_limit} books reached! Finishing scraper run."
+                        f"Target of {target} books reached! Finishing scraper run."
                     )
-                    self.db.end_scraper_run(
+                    db.end_scraper_run(
                         "completed",
                         f"Successfully imported {total_books_processed} books",
                     )
                     return
 
-                # Small delay between batches
-                time.sleep(BATCH_DELAY_SECONDS)
+                # No fixed inter-batch sleep: the token-bucket rate limiter
+                # is the sole pacing mechanism, so the loop proceeds
+                # immediately whenever request budget remains
 
             # Graceful shutdown
-            self.db.end_scraper_run("stopped", "Gracefully stopped by signal")
+            db.end_scraper_run("stopped", "Gracefully stopped by signal")
 
         except Exception as e:
             logger.error(f"Fatal error in scraper: {e}", exc_info=True)
@@ -1071,6 +1958,7 @@ class HardcoverScraper:
             raise
 
         finally:
+            prefetch.shutdown(wait=False, cancel_futures=True)
             self.db.disconnect()
             logger.info("Scraper stopped")
 
@@ -1079,6 +1967,11 @@ def main():
     """Entry point"""
     try:
         scraper = HardcoverScraper()
+        # Setup signal handlers for graceful shutdown; registration only
+        # works from (and belongs to) the main thread
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, scraper._signal_handler)
+            signal.signal(signal.SIGTERM, scraper._signal_handler)
         scraper.run()
     except Exception as e:
         logger.error(f"Scraper failed to start: {e}", exc_info=True)
@@ -0,0 +1,7 @@
+-- Unique arbiter for the author upsert.
+-- The scraper upserts authors with ON CONFLICT (external_source,
+-- external_id), which needs a plain unique index on those columns;
+-- the existing idx_authors_external is non-unique (and partial), so
+-- Postgres cannot use it as a conflict arbiter.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_authors_external_unique
+    ON authors (external_source, external_id);
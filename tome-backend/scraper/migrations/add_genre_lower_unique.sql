@@ -0,0 +1,6 @@
+-- Case-insensitive uniqueness for genre names.
+-- The scraper upserts genres with ON CONFLICT ((LOWER(name))), which needs
+-- a unique expression index; the existing UNIQUE(name) constraint only
+-- covers exact-case duplicates.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_genres_name_lower
+    ON genres (LOWER(name));
@@ -0,0 +1,6 @@
+-- Keyset pagination cursor for the Hardcover scraper.
+-- The scraper now paginates by (users_count, id) instead of offset;
+-- last_users_count plus the existing last_hardcover_book_id persist the
+-- cursor so interrupted runs can resume without re-scanning earlier pages.
+ALTER TABLE scraper_runs
+    ADD COLUMN IF NOT EXISTS last_users_count INTEGER;